@@ -4,7 +4,7 @@ from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, Uploa
 from fastapi.responses import FileResponse
 
 from src.core.logging import logger
-from src.services.image_service import bytes_to_image, resize_image, save_image_to_file
+from src.services.image_service import resize_image, save_image_to_file, upload_to_image
 
 image_router = APIRouter(prefix="/image", tags=["image"])
 
@@ -19,15 +19,19 @@ def remove_file(path: str):
 @image_router.post("/grayscale")
 async def image_grayscale(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     try:
-        content = await file.read()
-        img = bytes_to_image(content, is_grayscale=True)
+        img = await upload_to_image(file, is_grayscale=True)
         img_file_path = save_image_to_file(img, "jpg")
 
         # Clean up file after sending
         background_tasks.add_task(remove_file, img_file_path)
 
         file_name = file.filename.rsplit('.', 1)[0]
-        return FileResponse(img_file_path, media_type="application/octet-stream", filename=f"{file_name}.stl")
+        return FileResponse(
+            img_file_path,
+            stat_result=os.stat(img_file_path),
+            media_type="application/octet-stream",
+            filename=f"{file_name}.stl"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -40,8 +44,7 @@ async def image_resize(
         height_mm: float = Form(15.0, description="Target height in mm"),
 ):
     try:
-        content = await file.read()
-        img = bytes_to_image(content, is_grayscale=False)
+        img = await upload_to_image(file, is_grayscale=False)
         img = resize_image(img, width_mm, height_mm, 20)
         img_file_path = save_image_to_file(img, "jpg")
 
@@ -49,6 +52,11 @@ async def image_resize(
         background_tasks.add_task(remove_file, img_file_path)
 
         file_name = file.filename.rsplit('.', 1)[0]
-        return FileResponse(img_file_path, media_type="application/octet-stream", filename=f"{file_name}_resized.jpg")
+        return FileResponse(
+            img_file_path,
+            stat_result=os.stat(img_file_path),
+            media_type="application/octet-stream",
+            filename=f"{file_name}_resized.jpg"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,11 +1,15 @@
+import asyncio
 import os
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 
-from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse
 
 from src.core.logging import logger
-from src.services.image_service import bytes_to_image, resize_image
+from src.services.image_service import resize_image, upload_to_image
 from src.services.stl_service import image_to_stl
+from src.utils.common_utils import create_process_pool
 
 stl_router = APIRouter(prefix="/stl", tags=["stl"])
 
@@ -13,13 +17,46 @@ stl_router = APIRouter(prefix="/stl", tags=["stl"])
 def remove_file(path: str):
     try:
         os.remove(path)
-        logger.info(f"File removed successfully: {path}")
+        logger.info("File removed successfully: %s", path)
     except Exception as e:
         logger.debug(e)
 
 
+def _replace_pool(app: FastAPI, broken_pool):
+    # Concurrent requests may see the same broken pool, only the first one replaces it
+    if app.state.pool is broken_pool:
+        logger.warning("STL worker pool is broken, starting a new one")
+        broken_pool.shutdown(wait=False)
+        app.state.pool = create_process_pool()
+    return app.state.pool
+
+
+async def run_in_pool(app: FastAPI, func):
+    """Runs func in the app's process pool, replacing the pool if a worker died.
+
+    A pool broken by an earlier job is replaced and the call goes ahead. If the
+    worker dies while running func itself, the pool is replaced and a 503 is
+    raised instead of retrying a job that may crash it again.
+    Without a pool (lifespan not run) the loop's default thread pool is used.
+    """
+    loop = asyncio.get_running_loop()
+    pool = getattr(app.state, "pool", None)
+    try:
+        future = loop.run_in_executor(pool, func)
+    except BrokenProcessPool:
+        pool = _replace_pool(app, pool)
+        future = loop.run_in_executor(pool, func)
+
+    try:
+        return await future
+    except BrokenProcessPool:
+        _replace_pool(app, pool)
+        raise HTTPException(status_code=503, detail="STL worker crashed, please try again.")
+
+
 @stl_router.post("/flat")
 async def flat_lithophane(
+        request: Request,
         background_tasks: BackgroundTasks,
         file: UploadFile = File(...),
         frame_thick_mm: float = Form(1.0, description="Frame thickness in mm"),
@@ -31,8 +68,7 @@ async def flat_lithophane(
         resolution: int = Form(5, description="Image resolution in pixels per mm")
 ):
     try:
-        content = await file.read()
-        img = bytes_to_image(content, is_grayscale=True)
+        img = await upload_to_image(file, is_grayscale=True)
 
         # Adjust dimensions based on image orientation
         if img.shape[1] > img.shape[0]:
@@ -46,15 +82,16 @@ async def flat_lithophane(
         # Resize image
         img = resize_image(img=img, width=width_mm, height=height_mm, resolution=resolution)
 
-        # Generate STL
-        stl_path = image_to_stl(
+        # Generate STL in the process pool
+        stl_path = await run_in_pool(request.app, partial(
+            image_to_stl,
             image=img,
             max_th=max_thickness,
             min_th=min_thickness,
             frame_thick_mm=frame_thick_mm,
             frame_height_mm=frame_height_mm,
             resolution=resolution
-        )
+        ))
 
         # Clean up file after sending
         background_tasks.add_task(remove_file, stl_path)
@@ -62,9 +99,12 @@ async def flat_lithophane(
         file_name = file.filename.rsplit('.', 1)[0]
         return FileResponse(
             stl_path,
+            stat_result=os.stat(stl_path),
             media_type="application/octet-stream",
             filename=f"{file_name}.stl"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,3 @@
-from functools import lru_cache
-
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,6 +16,8 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env")
 
 
-@lru_cache
+_SETTINGS = Settings()
+
+
 def get_settings():
-    return Settings()
+    return _SETTINGS
@@ -5,7 +5,7 @@ from src.core.logging import logger
 
 
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global exception: {exc}", exc_info=True)
+    logger.error("Global exception: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={"message": "Internal Server Error", "details": str(exc)},
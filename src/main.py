@@ -2,6 +2,7 @@ import os
 from contextlib import asynccontextmanager
 from threading import Timer
 
+import cv2
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,7 +13,7 @@ from src.api.stl_controller import stl_router
 from src.core.config import get_settings
 from src.core.exceptions import global_exception_handler
 from src.core.logging import logger
-from src.utils.common_utils import create_folder_if_not_exists, open_browser
+from src.utils.common_utils import create_folder_if_not_exists, create_process_pool, open_browser
 
 current_file_path = os.path.abspath(__file__)
 current_dir = os.path.dirname(current_file_path)
@@ -26,9 +27,13 @@ create_folder_if_not_exists(settings.TEMP_DIR)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    logger.info(f"{app} Application starting up...")
+    logger.info("%s Application starting up...", app)
+    cv2.setNumThreads(os.cpu_count() or 1)
+    # CPU-bound STL generation runs here so it neither blocks the event loop nor shares the GIL
+    app.state.pool = create_process_pool()
     yield
     # Shutdown
+    app.state.pool.shutdown()
     logger.info("Application shutting down...")
 
 
@@ -68,5 +73,8 @@ async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 if __name__ == "__main__":
-    Timer(2, open_browser, args=(settings.HOST, settings.PORT, "/")).start()
+    # Launch the browser from a daemon timer thread so it never delays or outlives the server
+    browser_timer = Timer(2, open_browser, args=(settings.HOST, settings.PORT, "/"))
+    browser_timer.daemon = True
+    browser_timer.start()
     uvicorn.run("src.main:app", host=settings.HOST, port=settings.PORT, reload=True)
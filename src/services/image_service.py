@@ -1,5 +1,25 @@
+import os
+from typing import BinaryIO
+
 import cv2
 import numpy as np
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    import cupy as cp
+    from cucim.skimage.transform import resize as gpu_resize
+
+    HAS_GPU = cp.cuda.runtime.getDeviceCount() > 0
+except Exception:
+    HAS_GPU = False
+
+try:
+    from turbojpeg import TJPF_BGR, TJPF_GRAY, TJSAMP_GRAY, TurboJPEG
+
+    turbo_jpeg = TurboJPEG()
+except Exception:
+    turbo_jpeg = None
 
 from src.core.config import get_settings
 from src.core.logging import logger
@@ -7,18 +27,69 @@ from src.utils.common_utils import generate_uuid_filename
 
 settings = get_settings()
 
+# Images with at least this many pixels are resized on the GPU when one is available
+GPU_RESIZE_MIN_PIXELS = 1_000_000
+
+# Same quality cv2.imwrite uses by default
+JPEG_QUALITY = 95
+
+
+def _interpolation_for(img: np.ndarray, target_w: int, target_h: int) -> int:
+    """Picks the OpenCV interpolation flag for resizing to the target size.
+
+    Args:
+        img (np.ndarray): Input image.
+        target_w (int): Target width in pixels.
+        target_h (int): Target height in pixels.
+
+    Returns:
+        int: INTER_AREA when shrinking, INTER_LINEAR_EXACT otherwise.
+    """
+    if target_w * target_h < img.shape[0] * img.shape[1]:
+        return cv2.INTER_AREA
+    return cv2.INTER_LINEAR_EXACT
+
+
+def _turbo_decode(nparr: np.ndarray, is_grayscale: bool) -> np.ndarray | None:
+    """Decodes a JPEG with libjpeg-turbo when PyTurboJPEG is available.
+
+    JPEGs carrying EXIF data are left to OpenCV, which applies the EXIF
+    orientation while decoding.
+
+    Args:
+        nparr (np.ndarray): Encoded image as a uint8 buffer.
+        is_grayscale (bool): Whether to load the image in grayscale.
+
+    Returns:
+        np.ndarray | None: Decoded image, or None if OpenCV should decode it.
+    """
+    if turbo_jpeg is None or nparr[:2].tobytes() != b"\xff\xd8":
+        return None
+    if b"Exif\x00\x00" in nparr[:65536].tobytes():
+        return None
+
+    try:
+        img = turbo_jpeg.decode(nparr, pixel_format=TJPF_GRAY if is_grayscale else TJPF_BGR)
+    except OSError:
+        return None
+    return img[..., 0] if is_grayscale else img
+
 
-def bytes_to_image(image_bytes: bytes, is_grayscale: bool) -> np.ndarray:
+def bytes_to_image(image_bytes: bytes | np.ndarray, is_grayscale: bool) -> np.ndarray:
     """Converts image bytes to a color numpy array.
 
     Args:
-        image_bytes (bytes): Image in bytes.
+        image_bytes (bytes | np.ndarray): Image in bytes or as a uint8 buffer.
         is_grayscale (bool): Whether to load the image in grayscale.
 
     Returns:
         np.ndarray: Image as a numpy array.
     """
     nparr = np.frombuffer(image_bytes, np.uint8)
+    img = _turbo_decode(nparr, is_grayscale)
+    if img is not None:
+        return img
+
     color = cv2.IMREAD_GRAYSCALE if is_grayscale else cv2.IMREAD_COLOR
     img = cv2.imdecode(nparr, color)
     if img is None:
@@ -26,6 +97,44 @@ def bytes_to_image(image_bytes: bytes, is_grayscale: bool) -> np.ndarray:
     return img
 
 
+def file_to_image(file: BinaryIO, is_grayscale: bool) -> np.ndarray:
+    """Decodes an image straight from a file object without an intermediate bytes copy.
+
+    Args:
+        file (BinaryIO): Seekable binary file, e.g. the spooled file of an upload.
+        is_grayscale (bool): Whether to load the image in grayscale.
+
+    Returns:
+        np.ndarray: Image as a numpy array.
+    """
+    size = file.seek(0, os.SEEK_END)
+    file.seek(0)
+    if hasattr(file, "readinto"):
+        nparr = np.empty(size, dtype=np.uint8)
+        nparr = nparr[:file.readinto(nparr)]
+    else:
+        nparr = np.frombuffer(file.read(), np.uint8)
+    return bytes_to_image(nparr, is_grayscale)
+
+
+async def upload_to_image(file: UploadFile, is_grayscale: bool) -> np.ndarray:
+    """Decodes an uploaded image without blocking the event loop on disk reads.
+
+    Uploads still held in memory are decoded inline, spools that rolled over
+    to disk are read and decoded in the threadpool.
+
+    Args:
+        file (UploadFile): Uploaded image file.
+        is_grayscale (bool): Whether to load the image in grayscale.
+
+    Returns:
+        np.ndarray: Image as a numpy array.
+    """
+    if file._in_memory:
+        return file_to_image(file.file, is_grayscale)
+    return await run_in_threadpool(file_to_image, file.file, is_grayscale)
+
+
 def add_border(img: np.ndarray, border: int) -> np.ndarray:
     """Adds a border to the image.
 
@@ -62,10 +171,20 @@ def resize_image(
     """
     target_w = int(width * resolution)
     target_h = int(height * resolution)
-    z_dim = img.shape[2] if len(img.shape) == 3 else 1
-    new_shape = (target_w, target_h, z_dim) if z_dim > 1 \
-        else (target_w, target_h)
-    img = cv2.resize(img, new_shape)
+
+    interpolation = _interpolation_for(img, target_w, target_h)
+
+    if HAS_GPU and img.shape[0] * img.shape[1] >= GPU_RESIZE_MIN_PIXELS:
+        # Anti-aliased shrinking stands in for INTER_AREA on the GPU
+        new_shape = (target_h, target_w) + img.shape[2:]
+        resized = gpu_resize(cp.asarray(img), new_shape, order=1, preserve_range=True,
+                             anti_aliasing=interpolation == cv2.INTER_AREA)
+        if np.issubdtype(img.dtype, np.integer):
+            limits = np.iinfo(img.dtype)
+            resized = cp.clip(cp.rint(resized), limits.min, limits.max)
+        return cp.asnumpy(resized).astype(img.dtype)
+
+    img = cv2.resize(img, (target_w, target_h), interpolation=interpolation)
     return img
 
 
@@ -84,14 +203,13 @@ def scale_image(img: np.ndarray, width_mm: int = 100, resolution: int = 10) -> n
     try:
         y_dim = img.shape[0]
         x_dim = img.shape[1]
-        z_dim = img.shape[2] if len(img.shape) == 3 else 1
         scale = width_mm * resolution / x_dim
-        new_shape = (int(y_dim * scale), int(x_dim * scale), z_dim) if z_dim > 1 \
-            else (int(y_dim * scale), int(x_dim * scale))
-        img = cv2.resize(img, new_shape)
+        target_w = int(x_dim * scale)
+        target_h = int(y_dim * scale)
+        img = cv2.resize(img, (target_w, target_h), interpolation=_interpolation_for(img, target_w, target_h))
         return img
     except Exception as e:
-        logger.error(f"Error scaling image: {e}")
+        logger.error("Error scaling image: %s", e)
         raise
 
 
@@ -135,8 +253,17 @@ def save_image_to_file(img: np.ndarray, extension: str) -> str:
         str: Path to the saved image file.
     """
     file_path = generate_uuid_filename(settings.TEMP_DIR, extension)
-    cv2.imwrite(file_path, img)
-    logger.info(f"{extension.upper()} generated successfully: {file_path}")
+    if turbo_jpeg is not None and extension.lstrip('.').lower() in ("jpg", "jpeg"):
+        if img.ndim == 2:
+            encoded = turbo_jpeg.encode(img[..., None], quality=JPEG_QUALITY,
+                                        pixel_format=TJPF_GRAY, jpeg_subsample=TJSAMP_GRAY)
+        else:
+            encoded = turbo_jpeg.encode(img, quality=JPEG_QUALITY)
+        with open(file_path, 'wb') as f:
+            f.write(encoded)
+    else:
+        cv2.imwrite(file_path, img)
+    logger.info("%s generated successfully: %s", extension.upper(), file_path)
     return file_path
 
 
@@ -1,5 +1,17 @@
+import functools
+import threading
+
 import numpy as np
-from stl import mesh
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import openstl
+except ImportError:
+    openstl = None
 
 from src.core.config import get_settings
 from src.core.logging import logger
@@ -7,8 +19,32 @@ from src.utils.common_utils import generate_uuid_filename
 
 settings = get_settings()
 
+# Binary STL triangle record: normal, three vertices and the attribute byte count
+STL_DTYPE = np.dtype([
+    ('n', '<3f4'),
+    ('v0', '<3f4'),
+    ('v1', '<3f4'),
+    ('v2', '<3f4'),
+    ('attr', '<u2'),
+])
+
+# Grids above this many points are built per call; every pool worker keeps its own cache
+_XY_GRID_CACHE_MAX_PIXELS = 1_000_000
 
-def add_frame_to_z(z, frame_mm, resolution: float = 5, extra_height_mm: float = 0) -> np.ndarray:
+# Per-thread scratch buffer for STL records, reused across requests and grown on demand
+_STL_BUFFER = threading.local()
+
+# Larger meshes get a one-off buffer so no thread or worker keeps a huge one alive (~1.3M triangles)
+_STL_BUFFER_MAX_BYTES = 64 * 1024 * 1024
+
+
+def add_frame_to_z(
+        z,
+        frame_mm,
+        resolution: float = 5,
+        extra_height_mm: float = 0,
+        back_plane: bool = False
+) -> np.ndarray:
     """Adds a frame around the z matrix.
 
     Args:
@@ -16,18 +52,23 @@ def add_frame_to_z(z, frame_mm, resolution: float = 5, extra_height_mm: float =
         frame_mm (float): Frame size in mm
         resolution (int, optional): Image resolution in pixels per mm. Defaults to 5.
         extra_height_mm (int, optional): Extra height to add to frame. Defaults to 0.
+        back_plane (bool, optional): Also surround the result with a 1 pixel zero rim so the
+            walls drop to the back plane. Defaults to False.
 
     Returns:
         np.ndarray: Z matrix with frame
     """
+    rim = 1 if back_plane else 0
     if frame_mm <= 0:
-        return z
+        return np.pad(z, rim, mode='constant', constant_values=0) if rim else z
 
+    # Frame and rim are padded in one allocation, then the outermost pixels are zeroed
     frame_pxl = int(frame_mm * resolution)
-    frame_height = np.max(z) + extra_height_mm
-    new_shape = (z.shape[0] + 2 * frame_pxl, z.shape[1] + 2 * frame_pxl)
-    z_framed = np.full(new_shape, frame_height)
-    z_framed[frame_pxl:-frame_pxl, frame_pxl:-frame_pxl] = z
+    frame_height = float(np.max(z) + extra_height_mm)
+    z_framed = np.pad(z, frame_pxl + rim, mode='constant', constant_values=frame_height)
+    if rim:
+        z_framed[0, :] = z_framed[-1, :] = 0
+        z_framed[:, 0] = z_framed[:, -1] = 0
     return z_framed
 
 
@@ -50,7 +91,8 @@ def jpg_to_stl(
         resolution (int, optional): Image resolution in pixels per mm. Defaults to 10.
 
     Returns:
-        tuple[np.ndarray, np.ndarray, np.ndarray]: x, y, z matrices
+        tuple[np.ndarray, np.ndarray, np.ndarray]: x, y, z matrices. x and y are read-only,
+            since they may be shared with other calls through the grid cache.
     """
 
     if len(image.shape) > 2:
@@ -66,35 +108,237 @@ def jpg_to_stl(
     # Flip image vertically
     image = np.flipud(image)
 
-    # Normalize image
-    image = image / np.max(image)
-
-    # Invert threshold for z matrix
-    image = 1 - np.double(image)
-
-    # Scale z matrix to desired max depth and add base height
+    # Normalize, invert and scale z matrix to desired max depth on top of the base height,
+    # i.e. offset + depth * (1 - image / max), computed in a single float32 buffer
+    # (binary STL stores float32, so wider types would only cost memory)
     depth_mm = max_thick - min_thick
     offset_mm = min_thick
-    z = image * depth_mm + offset_mm
+    # An all-black image has no range to normalize and becomes max thickness everywhere
+    max_value = float(np.max(image)) or 1.0
+    z = np.multiply(image, -depth_mm / max_value, dtype=np.float32)
+    z += offset_mm + depth_mm
 
-    # Add a frame around the image
+    # Add a frame around the image and a thin back plane
     z = add_frame_to_z(
         z=z,
         frame_mm=frame_thick_mm,
         resolution=resolution,
-        extra_height_mm=frame_height_mm
+        extra_height_mm=frame_height_mm,
+        back_plane=True
     )
 
-    # Add a thin back plane
-    z_with_back = np.zeros([z.shape[0] + 2, z.shape[1] + 2])
-    z_with_back[1:-1, 1:-1] = z
-    z = z_with_back
+    rows, cols = z.shape
+    if rows * cols <= _XY_GRID_CACHE_MAX_PIXELS:
+        x, y = _cached_xy_grid(rows, cols, resolution)
+    else:
+        x, y = _xy_grid(rows, cols, resolution)
+    return x, y, z
+
+
+def _xy_grid(rows: int, cols: int, resolution: int) -> tuple[np.ndarray, np.ndarray]:
+    """Builds the x and y coordinate grids for a z matrix of the given shape.
+
+    The arrays are read-only, since _cached_xy_grid shares them between calls.
+
+    Args:
+        rows (int): Number of grid rows
+        cols (int): Number of grid columns
+        resolution (int): Image resolution in pixels per mm
 
-    x1 = np.linspace(1, z.shape[1] / resolution, z.shape[1])
-    y1 = np.linspace(1, z.shape[0] / resolution, z.shape[0])
+    Returns:
+        tuple[np.ndarray, np.ndarray]: x, y matrices
+    """
+    x1 = np.linspace(1, cols / resolution, cols, dtype=np.float32)
+    y1 = np.linspace(1, rows / resolution, rows, dtype=np.float32)
     x, y = np.meshgrid(x1, y1)
-    x = np.fliplr(x)
-    return x, y, z
+    x = np.ascontiguousarray(np.fliplr(x))
+    x.setflags(write=False)
+    y.setflags(write=False)
+    return x, y
+
+
+# Repeated requests with the same size preset share the grids
+_cached_xy_grid = functools.lru_cache(maxsize=4)(_xy_grid)
+
+
+if numba is not None:
+    # Serial on purpose: numba's parallel threading layer keeps the interpreter
+    # from exiting once a kernel has run off the main thread (request workers).
+    @numba.njit(cache=True)
+    def _build_faces_jit(rows, cols, faces):
+        """Compiled counterpart of _build_faces, filling faces in the same order."""
+        offset = rows * cols
+        front_n = 2 * (rows - 1) * (cols - 1)
+        walls = 2 * front_n
+
+        for r in range(rows - 1):
+            # Front and back surfaces
+            for c in range(cols - 1):
+                idx = 2 * (r * (cols - 1) + c)
+                lt = r * cols + c
+                rt = lt + 1
+                lb = lt + cols
+                rb = lb + 1
+                faces[idx, 0], faces[idx, 1], faces[idx, 2] = lt, lb, rt
+                faces[idx + 1, 0], faces[idx + 1, 1], faces[idx + 1, 2] = rt, lb, rb
+                idx += front_n
+                faces[idx, 0], faces[idx, 1], faces[idx, 2] = lt + offset, rt + offset, lb + offset
+                faces[idx + 1, 0], faces[idx + 1, 1], faces[idx + 1, 2] = rt + offset, rb + offset, lb + offset
+
+            # Left and right walls
+            top = r * cols
+            bottom = top + cols
+            idx = walls + 2 * r
+            faces[idx, 0], faces[idx, 1], faces[idx, 2] = top, top + offset, bottom
+            faces[idx + 1, 0], faces[idx + 1, 1], faces[idx + 1, 2] = bottom, top + offset, bottom + offset
+            top += cols - 1
+            bottom += cols - 1
+            idx += 2 * (rows - 1)
+            faces[idx, 0], faces[idx, 1], faces[idx, 2] = top, bottom, top + offset
+            faces[idx + 1, 0], faces[idx + 1, 1], faces[idx + 1, 2] = bottom, bottom + offset, top + offset
+
+        # Upper and lower walls
+        walls += 4 * (rows - 1)
+        for c in range(cols - 1):
+            idx = walls + 2 * c
+            faces[idx, 0], faces[idx, 1], faces[idx, 2] = c, c + 1, c + offset
+            faces[idx + 1, 0], faces[idx + 1, 1], faces[idx + 1, 2] = c + 1, c + 1 + offset, c + offset
+            v = (rows - 1) * cols + c
+            idx += 2 * (cols - 1)
+            faces[idx, 0], faces[idx, 1], faces[idx, 2] = v, v + offset, v + 1
+            faces[idx + 1, 0], faces[idx + 1, 1], faces[idx + 1, 2] = v + 1, v + offset, v + 1 + offset
+
+
+def _build_faces(rows: int, cols: int) -> np.ndarray:
+    """Builds the triangle vertex indices of a closed lithophane grid.
+
+    Vertices are expected in row-major order, the front surface first and the
+    back plane right after it (offset by rows * cols). Indices are int32
+    unless the vertex count does not fit.
+
+    Args:
+        rows (int): Number of grid rows
+        cols (int): Number of grid columns
+
+    Returns:
+        np.ndarray: (N, 3) array of vertex indices
+    """
+    offset = rows * cols
+    dtype = np.int32 if 2 * offset <= np.iinfo(np.int32).max else np.int64
+    front_n = 2 * (rows - 1) * (cols - 1)
+    side_n = 2 * (rows - 1)
+    cap_n = 2 * (cols - 1)
+    faces = np.empty((2 * front_n + 2 * side_n + 2 * cap_n, 3), dtype)
+
+    if numba is not None:
+        _build_faces_jit(rows, cols, faces)
+        return faces
+
+    # Each block is a view into faces; two triangles per quad or wall segment, i.e. six indices per row
+    front, back, left, right, top, bottom = (
+        block.reshape(-1, 6)
+        for block in np.split(faces, np.cumsum([front_n, front_n, side_n, side_n, cap_n]))
+    )
+
+    # FreeCAD mantığı: Her hücreyi (quad) iki üçgenle (triangle) kapat
+    r, c = np.meshgrid(np.arange(rows - 1, dtype=dtype), np.arange(cols - 1, dtype=dtype), indexing='ij')
+    lt = (r * cols + c).ravel()  # Sol-Üst
+    rt = lt + 1  # Sağ-Üst
+    lb = lt + cols  # Sol-Alt
+    rb = lb + 1  # Sağ-Alt
+
+    # ÖN YÜZEY (Z+ Yönüne Bakar)
+    np.stack([lt, lb, rt, rt, lb, rb], axis=1, out=front)
+
+    # ARKA YÜZEY (Z- Yönüne Bakar - Sıralama Ters)
+    np.stack([lt, rt, lb, rt, rb, lb], axis=1, out=back)
+    back += offset
+
+    # WALLS (Waterproof)
+    left_top = np.arange(rows - 1, dtype=dtype) * cols
+    left_bottom = left_top + cols
+    np.stack([
+        left_top, left_top + offset, left_bottom,
+        left_bottom, left_top + offset, left_bottom + offset
+    ], axis=1, out=left)
+
+    right_top = left_top + cols - 1
+    right_bottom = right_top + cols
+    np.stack([
+        right_top, right_bottom, right_top + offset,
+        right_bottom, right_bottom + offset, right_top + offset
+    ], axis=1, out=right)
+
+    upper = np.arange(cols - 1, dtype=dtype)
+    np.stack([
+        upper, upper + 1, upper + offset,
+        upper + 1, upper + 1 + offset, upper + offset
+    ], axis=1, out=top)
+
+    lower = (rows - 1) * cols + upper
+    np.stack([
+        lower, lower + offset, lower + 1,
+        lower + 1, lower + offset, lower + 1 + offset
+    ], axis=1, out=bottom)
+
+    return faces
+
+
+def _stl_records(count: int) -> np.ndarray:
+    """Returns a reusable STL record array for the calling thread.
+
+    The array is a view on a thread-local buffer, so it is only valid until
+    the next call from the same thread and its contents are not cleared.
+    Requests above _STL_BUFFER_MAX_BYTES get a fresh buffer that is not kept.
+
+    Args:
+        count (int): Number of triangle records
+
+    Returns:
+        np.ndarray: (count,) array of STL_DTYPE records
+    """
+    size = count * STL_DTYPE.itemsize
+    if size > _STL_BUFFER_MAX_BYTES:
+        return np.empty(count, dtype=STL_DTYPE)
+
+    buffer = getattr(_STL_BUFFER, 'buffer', None)
+    if buffer is None or len(buffer) < size:
+        buffer = _STL_BUFFER.buffer = bytearray(size)
+    return np.frombuffer(buffer, dtype=STL_DTYPE, count=count)
+
+
+def write_stl(tri: np.ndarray, file_path: str) -> None:
+    """Writes triangles to a binary STL file.
+
+    Uses the openstl serializer when the optional ``fast`` extra is installed,
+    otherwise the records are packed into a structured array and written to
+    disk directly. Normals are unit length, or zero for degenerate triangles.
+
+    Args:
+        tri (np.ndarray): (N, 3, 3) array of triangle vertices
+        file_path (str): Output STL file path
+    """
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    if openstl is not None:
+        triangles = np.concatenate([normals[:, None, :], tri], axis=1).astype(np.float32, copy=False)
+        if not openstl.write(file_path, triangles, openstl.format.binary):
+            raise OSError(f"STL file could not be written: {file_path}")
+        return
+
+    records = _stl_records(len(tri))
+    records['n'] = normals
+    records['v0'] = tri[:, 0]
+    records['v1'] = tri[:, 1]
+    records['v2'] = tri[:, 2]
+    records['attr'] = 0
+
+    with open(file_path, 'wb') as f:
+        f.write(b'\x00' * 80)
+        f.write(np.array(len(records), dtype='<u4').tobytes())
+        records.tofile(f)
 
 
 def create_solid_lithophane(x, y, z, file_path) -> None:
@@ -107,56 +351,17 @@ def create_solid_lithophane(x, y, z, file_path) -> None:
         file_path (str): Output STL file path
     """
     rows, cols = z.shape
-    faces = []
+    faces = _build_faces(rows, cols)
 
     # Vertices: 1. Ön Yüzey (Kabartma), 2. Arka Düzlem (Z=0)
-    vertices = np.vstack([
-        np.column_stack([x.flatten(), y.flatten(), z.flatten()]),
-        np.column_stack([x.flatten(), y.flatten(), np.zeros_like(z.flatten())])
-    ])
-    offset = rows * cols
-
-    # FreeCAD mantığı: Her hücreyi (quad) iki üçgenle (triangle) kapat
-    for r in range(rows - 1):
-        for c in range(cols - 1):
-            lt = r * cols + c  # Sol-Üst
-            rt = lt + 1  # Sağ-Üst
-            lb = (r + 1) * cols + c  # Sol-Alt
-            rb = lb + 1  # Sağ-Alt
+    # Both share x/y, so indices wrap onto the grid instead of stacking a (2N, 3) vertex array
+    tri = np.empty(faces.shape + (3,), dtype=np.float32)
+    np.take(x.ravel(), faces, mode='wrap', out=tri[..., 0])
+    np.take(y.ravel(), faces, mode='wrap', out=tri[..., 1])
+    np.take(z.ravel(), faces, mode='wrap', out=tri[..., 2])
+    tri[..., 2][faces >= rows * cols] = 0
 
-            # ÖN YÜZEY (Z+ Yönüne Bakar)
-            faces.append([lt, lb, rt])
-            faces.append([rt, lb, rb])
-
-            # ARKA YÜZEY (Z- Yönüne Bakar - Sıralama Ters)
-            faces.append([lt + offset, rt + offset, lb + offset])
-            faces.append([rt + offset, rb + offset, lb + offset])
-
-    # WALLS (Waterproof)
-    for r in range(rows - 1):
-        # Left Side
-        faces.append([r * cols, r * cols + offset, (r + 1) * cols])
-        faces.append([(r + 1) * cols, r * cols + offset, (r + 1) * cols + offset])
-        # Right side
-        faces.append([r * cols + cols - 1, (r + 1) * cols + cols - 1, r * cols + cols - 1 + offset])
-        faces.append([(r + 1) * cols + cols - 1, (r + 1) * cols + cols - 1 + offset, r * cols + cols - 1 + offset])
-
-    for c in range(cols - 1):
-        # Upper side
-        faces.append([c, c + 1, c + offset])
-        faces.append([c + 1, c + 1 + offset, c + offset])
-        # Lower side
-        v = (rows - 1) * cols + c
-        faces.append([v, v + offset, v + 1])
-        faces.append([v + 1, v + offset, v + 1 + offset])
-
-    litho_mesh = mesh.Mesh(np.zeros(len(faces), dtype=mesh.Mesh.dtype))
-    for i, f in enumerate(faces):
-        litho_mesh.v0[i] = vertices[f[0]]
-        litho_mesh.v1[i] = vertices[f[1]]
-        litho_mesh.v2[i] = vertices[f[2]]
-
-    litho_mesh.save(file_path)
+    write_stl(tri, file_path)
 
 
 def image_to_stl(
@@ -191,9 +396,9 @@ def image_to_stl(
             frame_height_mm=frame_height_mm
         )
         create_solid_lithophane(x, y, z, file_path=output_stl_path)
-        logger.info(f"STL Service: Solid model created at {output_stl_path}")
+        logger.info("STL Service: Solid model created at %s", output_stl_path)
         return output_stl_path
 
     except Exception as e:
-        logger.debug(f"STL Service Error: {str(e)} {e.__traceback__.tb_lineno}")
-        raise e
+        logger.exception("STL Service Error: %s", e)
+        raise
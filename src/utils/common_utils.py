@@ -1,18 +1,31 @@
+import multiprocessing
 import os
-import uuid
+import secrets
 import webbrowser
+from concurrent.futures import ProcessPoolExecutor
+
+__all__ = ["create_folder_if_not_exists", "open_browser", "generate_uuid_filename", "create_process_pool"]
 
 
 def create_folder_if_not_exists(folder_path: str):
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
+    os.makedirs(folder_path, exist_ok=True)
+
+
+# Wildcard bind addresses are not browsable, point the browser at localhost instead
+_HOST_REMAP = {'0.0.0.0': 'localhost'}
 
 
 def open_browser(host: str, port: int, path: str = "/docs"):
-    url_host = host if host != '0.0.0.0' else 'localhost'
-    webbrowser.open_new(f"http://{url_host}:{port}/{path.lstrip('/')}")
+    url_host = _HOST_REMAP.get(host, host)
+    url_path = path[1:] if path.startswith('/') else path
+    webbrowser.open_new(f"http://{url_host}:{port}/{url_path}")
 
 
 def generate_uuid_filename(path: str, extension: str) -> str:
-    file_name = f"{uuid.uuid4()}.{extension.lstrip('.')}"
+    file_name = f"{secrets.token_hex(16)}.{extension.lstrip('.')}"
     return os.path.join(path, file_name)
+
+
+def create_process_pool() -> ProcessPoolExecutor:
+    # Spawned workers, since forking a process that already runs threads is unsafe
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
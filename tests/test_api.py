@@ -1,28 +1,35 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
 import cv2
 import numpy as np
+import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
 
-client = TestClient(app)
+# Dummy gradient image, encoded once for the whole module
+IMG_BYTES = cv2.imencode('.jpg', np.tile(np.arange(0, 200, 2, dtype=np.uint8), (100, 1)))[1].tobytes()
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Entering the client runs the app lifespan (process pool, thread settings) once per session
+    with TestClient(app) as test_client:
+        yield test_client
 
 
-def test_read_main():
+def test_read_main(client):
     # The new app doesn't have a root route, only /api/v1/stl/....
     # But usually swagger is at /docs.
     response = client.get("/docs")
     assert response.status_code == 200
 
 
-def test_stl_generation():
-    # Create a dummy black image
-    img = np.zeros((100, 100), dtype=np.uint8)
-    _, img_encoded = cv2.imencode('.jpg', img)
-    img_bytes = img_encoded.tobytes()
-
+def test_stl_generation(client):
     response = client.post(
         "/api/v1/stl/flat",
-        files={"file": ("test.jpg", img_bytes, "image/jpeg")},
+        files={"file": ("test.jpg", IMG_BYTES, "image/jpeg")},
         data={
             "border": 5,
             "max_thickness": 3.0,
@@ -34,7 +41,20 @@ def test_stl_generation():
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/octet-stream"
     assert len(response.content) > 0
-    # Check if it starts with standard binary STL header or ASCII 'solid'
-    # (binary usually starts empty or specific header, but we used numpy-stl)
-    # Binary STL has an 80 byte header then 4 byte triangle count.
-    assert len(response.content) > 84
+    # Binary STL has an 80 byte header, a 4 byte triangle count and 50 bytes per triangle.
+    count = int(np.frombuffer(response.content[80:84], dtype='<u4')[0])
+    assert count > 0
+    assert len(response.content) == 84 + 50 * count
+
+
+def test_stl_generation_recovers_from_dead_worker(client):
+    broken_pool = client.app.state.pool
+    with pytest.raises(BrokenProcessPool):
+        broken_pool.submit(os._exit, 1).result()
+
+    response = client.post(
+        "/api/v1/stl/flat",
+        files={"file": ("test.jpg", IMG_BYTES, "image/jpeg")},
+    )
+    assert response.status_code == 200
+    assert client.app.state.pool is not broken_pool
@@ -0,0 +1,75 @@
+import asyncio
+import tempfile
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import UploadFile
+
+from src.services import image_service
+from src.services.image_service import bytes_to_image, file_to_image, resize_image, scale_image, upload_to_image
+
+
+def _gradient(h, w):
+    return np.add.outer(np.arange(h), np.arange(w)).astype(np.uint8)
+
+
+@pytest.mark.parametrize("width, height", [(12.0, 8.0), (200.0, 150.0)])
+def test_resize_image_gpu_branch_matches_cpu(monkeypatch, width, height):
+    transform = pytest.importorskip("skimage.transform")
+    img = _gradient(120, 160)
+    expected = resize_image(img, width, height, resolution=2)
+
+    fake_cp = SimpleNamespace(asarray=np.asarray, asnumpy=np.asarray, rint=np.rint, clip=np.clip)
+    monkeypatch.setattr(image_service, "cp", fake_cp, raising=False)
+    monkeypatch.setattr(image_service, "gpu_resize", transform.resize, raising=False)
+    monkeypatch.setattr(image_service, "HAS_GPU", True)
+    monkeypatch.setattr(image_service, "GPU_RESIZE_MIN_PIXELS", 0)
+    resized = resize_image(img, width, height, resolution=2)
+
+    assert resized.dtype == np.uint8
+    assert resized.shape == expected.shape
+    assert np.abs(resized.astype(int) - expected.astype(int)).mean() < 0.5
+
+
+@pytest.mark.parametrize("shape", [(40, 60), (40, 60, 3)])
+def test_scale_image_keeps_aspect_ratio(shape):
+    img = np.zeros(shape, dtype=np.uint8)
+    scaled = scale_image(img, width_mm=30, resolution=4)
+
+    assert scaled.shape == (80, 120) + shape[2:]
+
+
+@pytest.mark.parametrize("spool_size, rolled", [(0, False), (1, True)])
+def test_file_to_image_matches_bytes(spool_size, rolled):
+    # max_size=0 never rolls over (in-memory upload), max_size=1 rolls over on the first write (on disk)
+    content = cv2.imencode('.png', _gradient(30, 20))[1].tobytes()
+    with tempfile.SpooledTemporaryFile(max_size=spool_size) as f:
+        f.write(content)
+        assert f._rolled is rolled
+        img = file_to_image(f, is_grayscale=True)
+
+    np.testing.assert_array_equal(img, bytes_to_image(content, is_grayscale=True))
+
+
+@pytest.mark.parametrize("spool_size", [0, 1])
+def test_upload_to_image_in_memory_and_on_disk(spool_size):
+    content = cv2.imencode('.png', _gradient(30, 20))[1].tobytes()
+    with tempfile.SpooledTemporaryFile(max_size=spool_size) as f:
+        f.write(content)
+        img = asyncio.run(upload_to_image(UploadFile(f, filename="test.png"), is_grayscale=True))
+
+    np.testing.assert_array_equal(img, bytes_to_image(content, is_grayscale=True))
+
+
+@pytest.mark.skipif(image_service.turbo_jpeg is None, reason="libjpeg-turbo is not available")
+@pytest.mark.parametrize("is_grayscale", [True, False])
+def test_turbo_decode_matches_opencv(is_grayscale):
+    content = cv2.imencode('.jpg', _gradient(30, 20))[1].tobytes()
+    color = cv2.IMREAD_GRAYSCALE if is_grayscale else cv2.IMREAD_COLOR
+    expected = cv2.imdecode(np.frombuffer(content, np.uint8), color)
+
+    img = bytes_to_image(content, is_grayscale=is_grayscale)
+    assert img.shape == expected.shape
+    assert np.abs(img.astype(int) - expected.astype(int)).max() <= 2
@@ -0,0 +1,165 @@
+import numpy as np
+import pytest
+
+from src.services import stl_service
+from src.services.stl_service import (
+    STL_DTYPE,
+    _build_faces,
+    add_frame_to_z,
+    create_solid_lithophane,
+    jpg_to_stl,
+    write_stl,
+)
+
+
+@pytest.fixture(params=["structured", "openstl"])
+def stl_writer(request, monkeypatch):
+    # Runs the test once per STL writer backend
+    if request.param == "openstl":
+        monkeypatch.setattr(stl_service, "openstl", pytest.importorskip("openstl"))
+    else:
+        monkeypatch.setattr(stl_service, "openstl", None)
+    return write_stl
+
+
+def _read_records(path):
+    with open(path, 'rb') as f:
+        f.read(80)
+        count = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+        records = np.fromfile(f, dtype=STL_DTYPE)
+    return count, records
+
+
+def _loop_faces(rows, cols):
+    # Reference implementation: the original per-cell loop
+    offset = rows * cols
+    faces = []
+    for r in range(rows - 1):
+        for c in range(cols - 1):
+            lt = r * cols + c
+            rt = lt + 1
+            lb = (r + 1) * cols + c
+            rb = lb + 1
+            faces.append([lt, lb, rt])
+            faces.append([rt, lb, rb])
+            faces.append([lt + offset, rt + offset, lb + offset])
+            faces.append([rt + offset, rb + offset, lb + offset])
+
+    for r in range(rows - 1):
+        faces.append([r * cols, r * cols + offset, (r + 1) * cols])
+        faces.append([(r + 1) * cols, r * cols + offset, (r + 1) * cols + offset])
+        faces.append([r * cols + cols - 1, (r + 1) * cols + cols - 1, r * cols + cols - 1 + offset])
+        faces.append([(r + 1) * cols + cols - 1, (r + 1) * cols + cols - 1 + offset, r * cols + cols - 1 + offset])
+
+    for c in range(cols - 1):
+        faces.append([c, c + 1, c + offset])
+        faces.append([c + 1, c + 1 + offset, c + offset])
+        v = (rows - 1) * cols + c
+        faces.append([v, v + offset, v + 1])
+        faces.append([v + 1, v + offset, v + 1 + offset])
+
+    return np.array(faces)
+
+
+def _sorted_rows(faces):
+    return faces[np.lexsort(faces.T[::-1])]
+
+
+@pytest.mark.parametrize("rows, cols", [(2, 2), (3, 5), (7, 4)])
+def test_build_faces_matches_loop(rows, cols):
+    faces = _build_faces(rows, cols)
+    expected = _loop_faces(rows, cols)
+
+    assert faces.shape == expected.shape
+    assert faces.dtype == np.int32
+    np.testing.assert_array_equal(_sorted_rows(faces), _sorted_rows(expected))
+
+
+@pytest.mark.parametrize("rows, cols", [(2, 2), (3, 5), (7, 4)])
+def test_build_faces_jit_matches_numpy(monkeypatch, rows, cols):
+    pytest.importorskip("numba")
+    faces = _build_faces(rows, cols)
+    monkeypatch.setattr(stl_service, "numba", None)
+
+    np.testing.assert_array_equal(faces, _build_faces(rows, cols))
+
+
+def test_write_stl_unit_normals(stl_writer, tmp_path):
+    tri = np.array([
+        [[0, 0, 0], [2, 0, 0], [0, 3, 0]],
+        [[0, 0, 0], [0, 0, 5], [4, 0, 0]],
+        [[0, 0, 0], [1, 1, 1], [2, 2, 2]],
+    ], dtype=np.float32)
+    path = tmp_path / "normals.stl"
+    stl_writer(tri, str(path))
+
+    _, records = _read_records(path)
+    np.testing.assert_allclose(records['n'], [[0, 0, 1], [0, 1, 0], [0, 0, 0]], atol=1e-6)
+
+
+def test_solid_lithophane_file_layout(stl_writer, tmp_path):
+    image = np.arange(12 * 9, dtype=np.uint8).reshape(12, 9) * 2
+    x, y, z = jpg_to_stl(image, frame_thick_mm=0.4, resolution=5)
+    rows, cols = z.shape
+    path = tmp_path / "litho.stl"
+    create_solid_lithophane(x, y, z, file_path=str(path))
+
+    count, records = _read_records(path)
+    expected = 4 * (rows - 1) * (cols - 1) + 4 * (rows - 1) + 4 * (cols - 1)
+    assert count == len(records) == expected
+    assert path.stat().st_size == 84 + 50 * expected
+    assert np.isfinite(records['v0']).all()
+
+
+def test_jpg_to_stl_black_image():
+    _, _, z = jpg_to_stl(np.zeros((6, 4), dtype=np.uint8), max_thick=3.0, min_thick=0.5, frame_thick_mm=0)
+
+    assert z.dtype == np.float32
+    np.testing.assert_allclose(z[1:-1, 1:-1], 3.0)
+
+
+def test_write_stl_reuses_buffer_without_stale_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(stl_service, "openstl", None)
+    big = np.ones((5, 3, 3), dtype=np.float32)
+    small = np.zeros((2, 3, 3), dtype=np.float32)
+    write_stl(big, str(tmp_path / "big.stl"))
+    write_stl(small, str(tmp_path / "small.stl"))
+
+    count, records = _read_records(tmp_path / "small.stl")
+    assert count == len(records) == 2
+    assert not records['v0'].any() and not records['attr'].any()
+
+
+@pytest.mark.parametrize("frame_mm", [0, 0.1, 0.4])
+def test_add_frame_to_z_back_plane(frame_mm):
+    z = np.arange(1, 13, dtype=np.float32).reshape(3, 4)
+    framed = add_frame_to_z(z, frame_mm, resolution=5, extra_height_mm=1)
+    expected = np.pad(framed, 1, mode='constant', constant_values=0)
+
+    result = add_frame_to_z(z, frame_mm, resolution=5, extra_height_mm=1, back_plane=True)
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_write_stl_does_not_retain_oversized_buffer(tmp_path, monkeypatch):
+    monkeypatch.setattr(stl_service, "openstl", None)
+    monkeypatch.setattr(stl_service, "_STL_BUFFER_MAX_BYTES", 4 * STL_DTYPE.itemsize)
+    write_stl(np.zeros((2, 3, 3), dtype=np.float32), str(tmp_path / "small.stl"))
+    retained = stl_service._STL_BUFFER.buffer
+
+    write_stl(np.ones((8, 3, 3), dtype=np.float32), str(tmp_path / "big.stl"))
+
+    assert stl_service._STL_BUFFER.buffer is retained
+    count, records = _read_records(tmp_path / "big.stl")
+    assert count == len(records) == 8
+    assert not records['attr'].any()
+
+
+@pytest.mark.parametrize("max_pixels", [0, 10_000])
+def test_jpg_to_stl_grids_are_read_only(monkeypatch, max_pixels):
+    monkeypatch.setattr(stl_service, "_XY_GRID_CACHE_MAX_PIXELS", max_pixels)
+    stl_service._cached_xy_grid.cache_clear()
+    x, y, _ = jpg_to_stl(np.arange(20, dtype=np.uint8).reshape(4, 5), frame_thick_mm=0)
+
+    assert not x.flags.writeable and not y.flags.writeable
+    assert stl_service._cached_xy_grid.cache_info().currsize == (1 if max_pixels else 0)